@@ -6,6 +6,7 @@ from box_agent.box import (
     box_search_folder_by_name,
     box_list_folder_content_by_folder_id,
     get_highlights_from_file,
+    get_highlights_from_files,
 )
 
 __all__ = [
@@ -15,4 +16,5 @@ __all__ = [
     "box_search_folder_by_name",
     "box_list_folder_content_by_folder_id",
     "get_highlights_from_file",
+    "get_highlights_from_files",
 ]
\ No newline at end of file
@@ -0,0 +1,74 @@
+import functools
+
+from agents import Agent
+from agents.tool import WebSearchTool
+
+from box_agent.box import (
+    file_search,
+    ask_box,
+    get_text_from_file,
+    box_search_folder_by_name,
+    box_list_folder_content_by_folder_id,
+    get_highlights_from_file,
+    get_highlights_from_files,
+)
+
+
+@functools.lru_cache(maxsize=1)
+def get_agent() -> Agent:
+    """
+    Get the Box agent with the Box and Highlights tools, built once per process.
+
+    Returns:
+        The Box agent
+    """
+    return Agent(
+        name="Box Agent",
+        instructions="""
+    You are a very helpful agent.
+    You have access to a number of tools from Box that allow you
+    to search for files in Box either holistically or by set criteria.
+
+    IMPORTANT WORKFLOW:
+    1. When a user asks about a file, first use file_search to find the file and get its ID.
+    2. Once you have the file ID, you can use other tools to work with the file.
+
+    For large files, especially PDFs, you should use the get_highlights_from_file tool
+    which will extract text, chunk it, and use the MK1 Highlights API to find the most
+    relevant parts of the document based on the user's query. This is more efficient
+    than trying to process the entire document at once.
+
+    CRITICAL - QUERY PRESERVATION:
+    When using the get_highlights_from_file tool, you MUST use the EXACT query provided by the user.
+    DO NOT rephrase, summarize, or modify the query in any way.
+    For example, if the user asks "Summarize the Balance sheet for each of the companies 2024 10k individually",
+    you should use "Summarize the Balance sheet for each of the companies 2024 10k individually" as the query,
+    NOT a simplified version like "Balance Sheet" or "Balance Sheet Summary".
+
+    The Highlights API works best when given the exact, detailed query from the user.
+    IMPORTANT - PARAMETER REQUIREMENTS:
+    When calling get_highlights_from_file, you MUST provide ALL required parameters:
+    - file_id: The ID of the file to analyze (you must get this from file_search first)
+    - query: The user's query or what information they're looking for
+    - max_highlights: The number of highlights to return (recommend using 5)
+
+    When you need highlights for the same query from several files, use get_highlights_from_files
+    with all of the file IDs instead of calling get_highlights_from_file once per file.
+
+    If you encounter any errors with Box authentication or access, inform the user that
+    there might be an issue with the Box credentials and suggest they check the error logs.
+
+    If you encounter any other errors, provide clear explanations to the user and suggest
+    alternative approaches. Your goal is to help the user find the information they need.
+        """,
+        tools=[
+            file_search,
+            ask_box,
+            get_text_from_file,
+            get_highlights_from_file,
+            get_highlights_from_files,
+            box_search_folder_by_name,
+            box_list_folder_content_by_folder_id,
+            WebSearchTool(),
+        ],
+    )
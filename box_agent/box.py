@@ -1,15 +1,23 @@
-from typing import List, Union
+import asyncio
+import functools
+import os
+import threading
+from typing import AsyncIterator, List, Union
 from box_agent.lib.box_api import (
     box_search,
     box_file_text_extract,
+    box_file_get_with_text_representation,
+    box_file_text_url,
+    box_file_text_url_stream,
     box_file_ai_ask,
     box_locate_folder_by_name,
     box_folder_list_content,
 )
-from box_agent.lib.box_auth import BoxAuth
+from box_agent.lib.box_auth import get_box_client
 from box_agent.highlights_api import HighlightsAPI
 from box_agent.chunking import chunker
 from box_agent.pdf_extractor import PDFTextExtractor
+from box_agent.lib.ttl_cache import TTLCache
 import logging
 from box_sdk_gen import (
     File,
@@ -19,6 +27,56 @@ import json
 
 from agents import function_tool
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# Chunked text per Box file ID and etag, so follow-up queries on an unchanged file skip download and chunking
+_file_chunks_cache = TTLCache(maxsize=64, ttl=3600)
+
+# Directory of a chunk cache keyed by file ID and etag that survives restarts (requires diskcache)
+CHUNK_CACHE_DIR = os.getenv("BOX_CHUNK_CACHE_DIR")
+CHUNK_CACHE_EXPIRE = 86400
+
+# Maximum number of files processed at once by get_highlights_from_files
+MAX_CONCURRENT_FILES = 8
+
+
+@functools.lru_cache(maxsize=1)
+def _disk_chunks_cache():
+    """
+    Get the persistent chunk cache, created on first use.
+
+    Returns:
+        A diskcache cache, or None if it is not configured or diskcache is not installed
+    """
+    if not CHUNK_CACHE_DIR:
+        return None
+    if diskcache is None:
+        logging.warning("BOX_CHUNK_CACHE_DIR is set but diskcache is not installed. The persistent chunk cache is disabled.")
+        return None
+    return diskcache.Cache(CHUNK_CACHE_DIR)
+
+
+def _get_file_info(file_id: str) -> File:
+    """
+    Get the name, etag and text representation of a Box file in one request. The etag changes
+    whenever a new version is uploaded.
+
+    Args:
+        file_id: The Box file ID
+
+    Returns:
+        The file with its name, etag and representations
+    """
+    return box_file_get_with_text_representation(get_box_client(), file_id, fields=["etag"])
+
 
 @function_tool
 async def file_search(
@@ -52,7 +110,7 @@ async def file_search(
 
     # Search for files with the query
     search_results = box_search(
-        BoxAuth().get_client(),
+        get_box_client(),
         query,
         file_extensions,
         # content_types,
@@ -90,7 +148,7 @@ async def ask_box(file_id: str, prompt: str) -> str:
 
     # ai_agent = box_ai_agent_ask()
     response = box_file_ai_ask(
-        BoxAuth().get_client(),
+        get_box_client(),
         file_id,
         prompt=prompt,
     )
@@ -115,7 +173,7 @@ async def get_text_from_file(file_id: str) -> str:
     if not isinstance(file_id, str):
         file_id = str(file_id)
 
-    response = box_file_text_extract(BoxAuth().get_client(), file_id)
+    response = box_file_text_extract(get_box_client(), file_id)
 
     return response
 
@@ -131,7 +189,7 @@ async def box_search_folder_by_name(folder_name: str) -> str:
         str: The folder ID.
     """
 
-    search_results = box_locate_folder_by_name(BoxAuth().get_client(), folder_name)
+    search_results = box_locate_folder_by_name(get_box_client(), folder_name)
 
     # Return the "id", "name", "description" of the search results
     search_results = [f"{folder.name} (id:{folder.id})" for folder in search_results]
@@ -159,7 +217,7 @@ async def box_list_folder_content_by_folder_id(
         folder_id = str(folder_id)
 
     response: List[Union[File, Folder]] = box_folder_list_content(
-        BoxAuth().get_client(), folder_id, is_recursive
+        get_box_client(), folder_id, is_recursive
     )
     # Convert the response to a json string
 
@@ -168,18 +226,69 @@ async def box_list_folder_content_by_folder_id(
             "id": item.id,
             "name": item.name,
             "type": item.type,
-            "description": item.description if hasattr(item, "description") else None,
+            "description": getattr(item, "description", None),
         }
         for item in response
     ]
+    if orjson is not None:
+        return orjson.dumps(response).decode()
     return json.dumps(response)
 
 
-@function_tool
-async def get_highlights_from_file(file_id: str, query: str, max_highlights: int) -> str:
+async def _stream_file_chunks(box_client, file: File, is_pdf: bool) -> AsyncIterator[str]:
+    """
+    Download, clean and chunk the text of a file in a worker thread, yielding chunks as they are made.
+
+    Args:
+        box_client: Box client instance
+        file: The file, fetched with its text representation
+        is_pdf: Whether the file is a PDF, whose text needs its whitespace normalized
+
+    Returns:
+        Async iterator over the chunks of the file's text
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=16)
+    stopped = threading.Event()
+    end_of_stream = object()
+
+    def produce():
+        try:
+            # The file was fetched with its representations, so only the download is left
+            url = box_file_text_url(box_client, file)
+            if url is None:
+                texts = []
+            elif is_pdf:
+                texts = PDFTextExtractor.extract_text_stream_from_box_url(url, box_client)
+            else:
+                texts = box_file_text_url_stream(box_client, url)
+            for chunk in chunker.chunk_stream(texts):
+                if stopped.is_set():
+                    return
+                # Blocks while the queue is full, so extraction never runs far ahead of scoring
+                asyncio.run_coroutine_threadsafe(queue.put(chunk), loop).result()
+        finally:
+            asyncio.run_coroutine_threadsafe(queue.put(end_of_stream), loop).result()
+
+    producer = asyncio.ensure_future(asyncio.to_thread(produce))
+    try:
+        while (chunk := await queue.get()) is not end_of_stream:
+            yield chunk
+        # Raise any error from extraction
+        await producer
+    finally:
+        # Unblock the producer if the consumer stopped early
+        stopped.set()
+        while not queue.empty():
+            queue.get_nowait()
+
+
+async def _get_highlights_from_file(file_id: str, query: str, max_highlights: int) -> str:
     """
     Extract text from a file, chunk it, and get highlights based on a query using MK1 Highlights API.
 
+    Blocking Box and Highlights calls run in worker threads so several files can be processed concurrently.
+
     Args:
         file_id: The Box file ID
         query: The query to find relevant highlights for
@@ -190,38 +299,49 @@ async def get_highlights_from_file(file_id: str, query: str, max_highlights: int
     """
     try:
         # Get Box client
-        box_client = BoxAuth().get_client()
+        box_client = get_box_client()
         if box_client is None:
             return "Error: Box authentication failed. Please check your Box credentials in the .env file."
 
-        file_info = box_client.files.get_file_by_id(file_id)
-        file_name = file_info.name
+        # One request gives the etag for the cache lookup and, on a miss, the text download URL
+        file = await asyncio.to_thread(_get_file_info, file_id)
+        file_name, etag = file.name, file.etag
         logging.debug(f"Processing file: {file_name} (ID: {file_id})")
 
-        # Extract text from the file
-        if file_name.lower().endswith('.pdf'):
-            # For PDF files, use the PDF extractor
-            logging.debug(f"Extracting text from PDF file: {file_name}")
-            text = PDFTextExtractor.extract_text_from_box_file(file_id, box_client)
+        # Keyed by etag, so chunks of a previous version of the file are never reused
+        chunks = _file_chunks_cache.get((file_id, etag))
+        disk_cache = _disk_chunks_cache()
+        disk_key = f"chunks:{file_id}:{etag}"
+        if chunks is None and disk_cache is not None:
+            # Chunks from an earlier run, reused under the same etag
+            chunks = await asyncio.to_thread(disk_cache.get, disk_key)
+            if chunks is not None:
+                _file_chunks_cache.set((file_id, etag), chunks)
+
+        if chunks is not None:
+            logging.debug(f"Using {len(chunks)} cached chunks for {file_name}")
+            highlights = await HighlightsAPI().get_highlights_from_chunks_async(chunks, query)
         else:
-            # For other files, use the Box API
-            logging.debug(f"Extracting text from non-PDF file: {file_name}")
-            text = await box_file_text_extract(file_id)
+            # Chunks are scored as they are extracted, and collected for follow-up queries
+            chunks = []
+            stream = _stream_file_chunks(box_client, file, file_name.lower().endswith('.pdf'))
 
-        if not text:
-            logging.error(f"Failed to extract text from file {file_name} (ID: {file_id})")
-            return f"Failed to extract text from file {file_name} (ID: {file_id})."
+            async def collect_chunks():
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    yield chunk
 
-        # Log text length
-        logging.debug(f"Extracted {len(text)} characters of text from {file_name}")
+            logging.debug(f"Requesting highlights for query: '{query}'")
+            highlights = await HighlightsAPI().get_highlights_from_chunk_stream_async(collect_chunks(), query)
 
-        # Chunk the text
-        chunks = chunker.chunk(text)
-        logging.debug(f"Created {len(chunks)} chunks from {file_name}")
+            if not chunks:
+                logging.error(f"Failed to extract text from file {file_name} (ID: {file_id})")
+                return f"Failed to extract text from file {file_name} (ID: {file_id})."
 
-        # Get highlights from chunks
-        logging.debug(f"Requesting highlights for query: '{query}'")
-        highlights = HighlightsAPI().get_highlights_from_chunks(chunks, query)
+            logging.debug(f"Created {len(chunks)} chunks from {file_name}")
+            _file_chunks_cache.set((file_id, etag), chunks)
+            if disk_cache is not None:
+                await asyncio.to_thread(disk_cache.set, disk_key, chunks, expire=CHUNK_CACHE_EXPIRE)
 
         # Limit the number of highlights
         highlights = highlights[:max_highlights]
@@ -231,13 +351,52 @@ async def get_highlights_from_file(file_id: str, query: str, max_highlights: int
             return f"No relevant highlights found in file {file_name} (ID: {file_id}) for query: {query}"
 
         # Format the highlights
-        result = f"Highlights from {file_name} (ID: {file_id}) for query: {query}\n\n"
-
-        for i, highlight in enumerate(highlights, 1):
-            result += f"{i}. {highlight['text']}\n"
+        lines = [f"Highlights from {file_name} (ID: {file_id}) for query: {query}\n"]
+        lines.extend(f"{i}. {highlight['text']}" for i, highlight in enumerate(highlights, 1))
 
-        return result
+        return "\n".join(lines) + "\n"
 
     except Exception as e:
         logging.error(f"Error getting highlights: {e}")
         return f"Error getting highlights from file (ID: {file_id}): {str(e)}"
+
+
+@function_tool
+async def get_highlights_from_file(file_id: str, query: str, max_highlights: int) -> str:
+    """
+    Extract text from a file, chunk it, and get highlights based on a query using MK1 Highlights API.
+
+    Args:
+        file_id: The Box file ID
+        query: The query to find relevant highlights for
+        max_highlights: Maximum number of highlights to return
+
+    Returns:
+        A string containing the most relevant highlights from the file
+    """
+    return await _get_highlights_from_file(file_id, query, max_highlights)
+
+
+@function_tool
+async def get_highlights_from_files(file_ids: List[str], query: str, max_highlights: int) -> str:
+    """
+    Get highlights based on a query from several files at once using MK1 Highlights API.
+    The files are processed concurrently, which is faster than calling get_highlights_from_file for each file.
+
+    Args:
+        file_ids: The Box file IDs
+        query: The query to find relevant highlights for
+        max_highlights: Maximum number of highlights to return per file
+
+    Returns:
+        A string containing the most relevant highlights from each file
+    """
+    # Bound the number of files in flight to stay within Box rate limits
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FILES)
+
+    async def process(file_id: str) -> str:
+        async with semaphore:
+            return await _get_highlights_from_file(str(file_id), query, max_highlights)
+
+    results = await asyncio.gather(*(process(file_id) for file_id in file_ids))
+    return "\n".join(results)
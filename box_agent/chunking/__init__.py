@@ -1,7 +1,7 @@
 from .base_chunker import BaseChunker
-from .text_chunker import TextChunker, Chunk
+from .text_chunker import TextChunker
 
 # Create an instance of TextChunker to export as chunker
 chunker = TextChunker()
 
-__all__ = ["BaseChunker", "TextChunker", "Chunk", "chunker"]
\ No newline at end of file
+__all__ = ["BaseChunker", "TextChunker", "chunker"]
\ No newline at end of file
@@ -1,24 +1,17 @@
-import math
 import re
-from typing import List
-from dataclasses import dataclass
+from typing import Iterable, Iterator, List
 from .base_chunker import BaseChunker
 
 
-@dataclass
-class Chunk:
-    text: str
-    delimiter: str | None
-
-    def get_len(self) -> int:
-        """Get total length including delimiter"""
-        if self.delimiter is None:
-            return len(self.text)
-        return len(self.text) + len(self.delimiter)
-
-    def get_text_len(self) -> int:
-        """Get length of text only, excluding delimiter"""
-        return len(self.text)
+# Split patterns from the coarsest tier to the finest: paragraphs, newlines, sentences,
+# delimiters (commas, colons, semicolons) and spaces. Each captures its delimiter.
+_TIER_RES = (
+    re.compile(r'(\n\n)'),
+    re.compile(r'(\n)'),
+    re.compile(r'((?<=[.!?])\s)'),
+    re.compile(r'(,\s+|:\s+|;\s+)'),
+    re.compile(r'( )'),
+)
 
 
 class TextChunker(BaseChunker):
@@ -39,169 +32,82 @@ class TextChunker(BaseChunker):
         4. If needed, split by delimiters (commas, colons, etc.)
         5. If needed, split by spaces
         6. If needed, split by character count
+
+        Only pieces that are still too large are split at the next tier. The resulting pieces
+        are then recombined in a single greedy pass into chunks of at most max_chunk_size characters.
         """
         if not text:
             return []
 
-        # Start with the entire text as one chunk
-        chunks = [Chunk(text, None)]
-
-        # Apply increasingly fine-grained chunking as needed
-        chunks = self._refine_chunks(chunks)
-
-        text_chunks = []
-        for chunk in chunks:
-            text_chunk = chunk.text
-            # Only append the delimiter if it is not None
-            if chunk.delimiter is not None:
-                text_chunk += chunk.delimiter
-            text_chunks.append(text_chunk)
-
-        return text_chunks
-
-    def _refine_chunks(self, chunks: List[Chunk]) -> List[Chunk]:
-        """Apply increasingly fine-grained chunking methods as needed, with recombination."""
-        chunks = self._refine_by_paragraphs(chunks)
-        chunks = self._refine_by_newlines(chunks)
-        chunks = self._refine_by_sentences(chunks)
-        chunks = self._refine_by_delimiters(chunks)
-        chunks = self._refine_by_spaces(chunks)
-        chunks = self._refine_by_characters(chunks)
-        return chunks
+        max_size = self.max_chunk_size
+        if len(text) <= max_size:
+            return [text]
 
-    def _recombine_chunks(self, chunks: List[Chunk]) -> List[Chunk]:
-        """Recombine adjacent chunks using their delimiters until they exceed max_chunk_size."""
-        if not chunks:
-            return []
+        pieces: List[str] = []
+        self._split(text, 0, pieces)
 
-        recombined = []
-        current_chunk = Chunk(chunks[0].text, chunks[0].delimiter)
+        # Greedily recombine adjacent pieces, joining each chunk's parts only once
+        chunks = []
+        parts = []
+        size = 0
+        for piece in pieces:
+            if parts and size + len(piece) > max_size:
+                chunks.append("".join(parts))
+                parts = []
+                size = 0
+            parts.append(piece)
+            size += len(piece)
 
-        for i in range(1, len(chunks)):
-            next_chunk = chunks[i]
-            potential_chunk = Chunk(current_chunk.text + (current_chunk.delimiter or "") + next_chunk.text, next_chunk.delimiter)
+        if parts:
+            chunks.append("".join(parts))
 
-            if potential_chunk.get_len() > self.max_chunk_size:
-                recombined.append(current_chunk)
-                current_chunk = next_chunk
-            else:
-                current_chunk = potential_chunk
-
-        # Add the last chunk
-        recombined.append(current_chunk)
-
-        return recombined
-
-    def _refine_by_paragraphs(self, chunks: List[Chunk]) -> List[Chunk]:
-        """Split chunks by paragraphs if they're too large."""
-        refined = []
-        for chunk in chunks:
-            if chunk.get_len() <= self.max_chunk_size:
-                refined.append(chunk)
-                continue
-
-            para_chunks = chunk.text.split("\n\n")
-            refined.extend(Chunk(c, "\n\n") for c in para_chunks[:-1])
-            refined.append(Chunk(para_chunks[-1], chunk.delimiter))
-        return self._recombine_chunks(refined)
-
-    def _refine_by_newlines(self, chunks: List[Chunk]) -> List[Chunk]:
-        """Split chunks by newlines if they're too large."""
-        refined = []
-        for chunk in chunks:
-            if chunk.get_len() <= self.max_chunk_size:
-                refined.append(chunk)
-                continue
-
-            line_chunks = chunk.text.split("\n")
-            refined.extend(Chunk(c, "\n") for c in line_chunks[:-1])
-            refined.append(Chunk(line_chunks[-1], chunk.delimiter))
-        return self._recombine_chunks(refined)
-
-    def _refine_by_sentences(self, chunks: List[Chunk]) -> List[Chunk]:
-        """Split chunks by sentences if they're too large."""
-        refined = []
-        for chunk in chunks:
-            if chunk.get_len() <= self.max_chunk_size:
-                refined.append(chunk)
-                continue
-
-            # Split after a sentence-ending punctuation followed by a single space
-            sentence_chunks = re.split(r'(?<=[.!?])\s', chunk.text)
-
-            # For all chunks except the last one, extract their delimiter
-            for sentence in sentence_chunks[:-1]:
-                # The sentence already ends with punctuation due to the split pattern
-                refined.append(Chunk(sentence, " "))
-
-            # Handle the last chunk with the original chunk's delimiter
-            refined.append(Chunk(sentence_chunks[-1], chunk.delimiter))
-
-        return self._recombine_chunks(refined)
-
-    def _refine_by_delimiters(self, chunks: List[Chunk]) -> List[Chunk]:
-        """Split chunks by delimiters if they're too large."""
-        refined = []
-        for chunk in chunks:
-            if chunk.get_len() <= self.max_chunk_size:
-                refined.append(chunk)
-                continue
-
-            last_end = 0
-            chunk_refined = []
-
-            for match in re.finditer(r'(,\s+|:\s+|;\s+)', chunk.text):
-                text = chunk.text[last_end:match.start()]
-                if text:
-                    chunk_refined.append(Chunk(text.strip(), match.group()))
-                last_end = match.end()
-
-            final_text = chunk.text[last_end:]
-            if final_text:
-                chunk_refined.append(Chunk(final_text.strip(), chunk.delimiter))
-            elif chunk_refined:
-                last_chunk = chunk_refined[-1]
-                chunk_refined[-1] = Chunk(last_chunk.text, chunk.delimiter)
-
-            refined.extend(chunk_refined)
-        return self._recombine_chunks(refined)
-
-    def _refine_by_spaces(self, chunks: List[Chunk]) -> List[Chunk]:
-        """Split chunks by spaces if they're too large."""
-        refined = []
-        for chunk in chunks:
-            if chunk.get_len() <= self.max_chunk_size:
-                refined.append(chunk)
-                continue
-
-            space_chunks = chunk.text.split(" ")
-            refined.extend(Chunk(c, " ") for c in space_chunks[:-1])
-            refined.append(Chunk(space_chunks[-1], chunk.delimiter))
-        return self._recombine_chunks(refined)
-
-    def _refine_by_characters(self, chunks: List[Chunk]) -> List[Chunk]:
-        """Split chunks by character count if they're too large."""
-        refined = []
-        for chunk in chunks:
-            if chunk.get_len() <= self.max_chunk_size:
-                refined.append(chunk)
-                continue
-
-            char_chunks = [chunk.text[i:i + self.max_chunk_size]
-                          for i in range(0, len(chunk.text), self.max_chunk_size)]
-            refined.extend(Chunk(c, "") for c in char_chunks[:-1])
-
-            # Handle the last chunk carefully with its delimiter
-            last_chunk = char_chunks[-1]
-            if len(last_chunk) + len(chunk.delimiter or "") > self.max_chunk_size:
-                # Split the last somewhat evenly, distributing the delimiter length
-                delimiter_len = len(chunk.delimiter or "")
-                first_part_len = min(len(last_chunk) // 2 + delimiter_len, len(last_chunk))
-
-                refined.append(Chunk(last_chunk[:first_part_len], ""))
-                refined.append(Chunk(last_chunk[first_part_len:], chunk.delimiter))
+        return chunks
 
-            else:
-                refined.append(Chunk(last_chunk, chunk.delimiter))
+    def chunk_stream(self, texts: Iterable[str]) -> Iterator[str]:
+        """
+        Chunk text that arrives in pieces, yielding chunks as soon as they are complete.
 
-        return self._recombine_chunks(refined)
\ No newline at end of file
+        Text is buffered until it holds several chunks' worth, then chunked. The last chunk is held
+        back and chunked again with the text that follows, so the result only differs from chunk()
+        near buffer boundaries while memory stays bounded by the buffer size.
+        """
+        buffer_size = self.max_chunk_size * 8
+        buffer = []
+        size = 0
+        for text in texts:
+            buffer.append(text)
+            size += len(text)
+            if size >= buffer_size:
+                chunks = self.chunk("".join(buffer))
+                yield from chunks[:-1]
+                buffer = [chunks[-1]]
+                size = len(chunks[-1])
+
+        if size:
+            yield from self.chunk("".join(buffer))
+
+    def _split(self, text: str, tier: int, pieces: List[str]) -> None:
+        """
+        Split text that is too large at the given tier, appending the pieces that fit to pieces
+        and splitting the others at the next tier. Each piece keeps its trailing delimiter.
+        """
+        max_size = self.max_chunk_size
+
+        if tier == len(_TIER_RES):
+            # No delimiters left, split by character count
+            pieces.extend(text[i:i + max_size] for i in range(0, len(text), max_size))
+            return
+
+        parts = _TIER_RES[tier].split(text)
+        if len(parts) == 1:
+            self._split(text, tier + 1, pieces)
+            return
+
+        # parts alternates between text and the delimiter that follows it
+        for i in range(0, len(parts), 2):
+            piece = parts[i] + parts[i + 1] if i + 1 < len(parts) else parts[i]
+            if len(piece) <= max_size:
+                if piece:
+                    pieces.append(piece)
+            else:
+                self._split(piece, tier + 1, pieces)
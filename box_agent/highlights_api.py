@@ -1,11 +1,28 @@
 import os
 import json
+import asyncio
+import gzip
+import hashlib
+import heapq
+import httpx
 import requests
 import logging
-import traceback
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from box_agent.lib.ttl_cache import TTLCache
+from box_agent.lib.semantic_cache import SemanticCache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
@@ -13,6 +30,13 @@ load_dotenv()
 # Get Highlights API key from environment variables
 HIGHLIGHTS_API_KEY = os.getenv("HIGHLIGHTS_API_KEY")
 
+# Reuse highlights for rephrased queries about the same document (requires fastembed)
+HIGHLIGHTS_SEMANTIC_CACHE = os.getenv("HIGHLIGHTS_SEMANTIC_CACHE", "").lower() in ("1", "true", "yes")
+
+_semantic_cache = SemanticCache() if HIGHLIGHTS_SEMANTIC_CACHE else None
+if _semantic_cache is not None and not _semantic_cache.enabled:
+    logger.warning("HIGHLIGHTS_SEMANTIC_CACHE is set but fastembed is not installed. The semantic cache is disabled.")
+
 
 class HighlightsAPI:
     """
@@ -21,6 +45,33 @@ class HighlightsAPI:
 
     BASE_URL = "https://api.highlights.mk1.ai/search"
 
+    # Documents with more chunks than this are scored as concurrent requests of this many chunks
+    BATCH_SIZE = 50
+    MAX_CONCURRENT_REQUESTS = 8
+
+    # Request bodies larger than this many bytes are sent gzip-compressed, unless the server rejected it
+    GZIP_MIN_SIZE = 4096
+    _gzip_supported = True
+
+    # Requests that get one of these statuses are retried up to MAX_RETRIES times with exponential backoff
+    RETRY_STATUSES = (502, 503, 504)
+    MAX_RETRIES = 3
+    RETRY_BACKOFF = 0.2
+
+    # Shared across instances so concurrent tool calls reuse pooled keep-alive connections
+    _session: Optional[requests.Session] = None
+    _session_lock = threading.Lock()
+
+    # Async client for the async methods, bound to the event loop it was created in
+    _async_client: Optional[httpx.AsyncClient] = None
+    _async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # Responses keyed by (query + chunks digest, top_n); shared so repeat tool calls skip the network
+    _cache = TTLCache(maxsize=512, ttl=3600)
+
+    # Responses keyed by chunks digest and query embedding, if enabled
+    _semantic_cache: Optional[SemanticCache] = _semantic_cache
+
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize the Highlights API client.
@@ -31,101 +82,416 @@ class HighlightsAPI:
         self.api_key = api_key or HIGHLIGHTS_API_KEY
 
         if not self.api_key or self.api_key == "your_highlights_api_key_here":
-            logging.warning("Highlights API key is not properly set. The Highlights functionality will not work correctly.")
+            logger.warning("Highlights API key is not properly set. The Highlights functionality will not work correctly.")
             self.api_key = "missing_api_key"
 
-    def get_highlights(self, text: str, query: str, max_highlights: int = 5) -> List[Dict[str, Any]]:
+        self._headers = {
+            "Content-Type": "application/json",
+            "X-API-Key": self.api_key
+        }
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
         """
-        Get highlights from text based on a query.
+        Get the shared HTTP session, creating it on first use.
+
+        Returns:
+            A requests session with connection pooling and retries on transient errors
+        """
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    retry = Retry(
+                        total=cls.MAX_RETRIES,
+                        backoff_factor=cls.RETRY_BACKOFF,
+                        status_forcelist=cls.RETRY_STATUSES,
+                        allowed_methods=["HEAD", "GET", "POST"],
+                        raise_on_status=False
+                    )
+                    session = requests.Session()
+                    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry))
+                    cls._session = session
+        return cls._session
+
+    @classmethod
+    def _get_async_client(cls) -> httpx.AsyncClient:
+        """
+        Get the shared async HTTP client for the running event loop, creating it on first use.
+
+        Returns:
+            An HTTP/2 httpx client whose requests share pooled connections
+        """
+        loop = asyncio.get_running_loop()
+        if cls._async_client is None or cls._async_client_loop is not loop:
+            cls._async_client = httpx.AsyncClient(
+                http2=True,
+                timeout=60,
+                # Idle connections are kept for a minute so a warmed-up connection outlasts the user typing
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60)
+            )
+            cls._async_client_loop = loop
+        return cls._async_client
+
+    @classmethod
+    async def awarm_up(cls) -> None:
+        """
+        Open a pooled connection to the Highlights API ahead of the first request, so that request
+        does not wait for the TCP and TLS handshakes. Errors are ignored.
+        """
+        try:
+            await cls._get_async_client().head(cls.BASE_URL, timeout=5)
+        except httpx.HTTPError as e:
+            logger.debug("Highlights API warm-up failed: %s", e)
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared async HTTP client. Call before the event loop shuts down."""
+        if cls._async_client is not None:
+            await cls._async_client.aclose()
+            cls._async_client = None
+            cls._async_client_loop = None
+
+    @staticmethod
+    def _cache_key(chunks: List[str], query: str, top_n: int) -> tuple:
+        """
+        Build the response cache key for a request.
+
+        Args:
+            chunks: List of text chunks
+            query: The query
+            top_n: Number of highlights requested
+
+        Returns:
+            A compact hashable key
+        """
+        digest = hashlib.blake2b((query + "\x1f" + "\x1f".join(chunks)).encode(), digest_size=16).digest()
+        return digest, top_n
+
+    def _check_text_request(self, text: str, query: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Check a single text request before anything is sent to the Highlights API.
 
         Args:
             text: The text to analyze
             query: The query to find relevant highlights for
-            max_highlights: Maximum number of highlights to return
 
         Returns:
-            List of highlights with text and relevance score
+            The result to return right away for an empty request or a missing API key, otherwise None
         """
         if not text or not text.strip():
-            logging.warning("Empty text provided to get_highlights")
+            logger.warning("Empty text provided to get_highlights")
             return []
 
         if not query or not query.strip():
-            logging.warning("Empty query provided to get_highlights")
+            logger.warning("Empty query provided to get_highlights")
             return []
 
         if self.api_key == "missing_api_key":
             # Simulate highlights for testing when API key is missing
-            logging.warning("Using simulated highlights due to missing API key")
+            logger.warning("Using simulated highlights due to missing API key")
             return [{"text": f"Simulated highlight for query: {query}", "relevance": 0.95}]
 
-        headers = {
-            "Content-Type": "application/json",
-            "X-API-Key": self.api_key
-        }
+        return None
+
+    def _check_chunks_request(self, chunks: List[str], query: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Check a chunks request before anything is sent to the Highlights API.
+
+        Args:
+            chunks: List of text chunks to analyze
+            query: The query to find relevant highlights for
+
+        Returns:
+            The result to return right away for an empty request or a missing API key, otherwise None
+        """
+        if not chunks:
+            logger.warning("Empty chunks provided to get_highlights_from_chunks")
+            return []
+
+        if not query or not query.strip():
+            logger.warning("Empty query provided to get_highlights_from_chunks")
+            return []
 
-        payload = {
+        if self.api_key == "missing_api_key":
+            # Simulate highlights for testing when API key is missing
+            logger.warning("Using simulated highlights due to missing API key")
+            return [{"text": f"Simulated highlight for query: {query} (chunk {i})", "relevance": 0.95 - (i * 0.05), "chunk_index": i}
+                    for i in range(min(5, len(chunks)))]
+
+        return None
+
+    @staticmethod
+    def _unique_chunks(chunks: List[str]) -> Tuple[List[str], List[int]]:
+        """
+        Remove repeated chunks such as page headers and footers so each is scored only once.
+
+        Args:
+            chunks: List of text chunks in document order
+
+        Returns:
+            The distinct chunks in order, and the position in the document where each first appears
+        """
+        first_indexes = {}
+        for index, chunk in enumerate(chunks):
+            first_indexes.setdefault(chunk, index)
+        return list(first_indexes), list(first_indexes.values())
+
+    def _payload(self, chunks: List[str], query: str, top_n: int) -> Dict[str, Any]:
+        """Build the request payload for a list of chunks."""
+        return {
             "query": query,
-            "chunk_txts": [text],
-            "top_n": max_highlights,
+            "chunk_txts": chunks,
+            "top_n": top_n,
             "true_order": True
         }
 
-        try:
-            # Only log to debug level to avoid console clutter
-            logging.debug(f"Sending request to Highlights API with query: {query}")
-            print(f"\n🔍 Highlights API: Sending request with query: '{query}'...")
+    def _encode_payload(self, payload: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+        """
+        Serialize a request payload, compressing it if it is large.
 
-            start_time = time.time()
-            response = requests.post(
+        Args:
+            payload: The request payload
+
+        Returns:
+            The request body and the headers to send with it
+        """
+        if orjson is not None:
+            body = orjson.dumps(payload)
+        else:
+            body = json.dumps(payload, separators=(',', ':')).encode()
+        if len(body) <= self.GZIP_MIN_SIZE or not self._gzip_supported:
+            return body, self._headers
+        return gzip.compress(body, compresslevel=1), {**self._headers, "Content-Encoding": "gzip"}
+
+    @classmethod
+    def _gzip_rejected(cls, response, headers: Dict[str, str]) -> bool:
+        """
+        Check whether the server rejected a compressed request body, and stop compressing if so.
+
+        Args:
+            response: The requests or httpx response
+            headers: The headers the request was sent with
+
+        Returns:
+            True if the request should be sent again uncompressed
+        """
+        if response.status_code != 415 or "Content-Encoding" not in headers:
+            return False
+        logger.warning("Highlights API does not accept gzip-compressed requests, sending them uncompressed")
+        cls._gzip_supported = False
+        return True
+
+    def _send(self, payload: Dict[str, Any], timeout: float) -> requests.Response:
+        """
+        Send a request payload to the Highlights API.
+
+        Args:
+            payload: The request payload
+            timeout: Request timeout in seconds
+
+        Returns:
+            The response
+        """
+        while True:
+            body, headers = self._encode_payload(payload)
+            response = self._get_session().post(
                 self.BASE_URL,
                 headers=headers,
-                json=payload,
-                timeout=30  # Add timeout to prevent hanging
+                data=body,
+                timeout=timeout
             )
-            request_time = time.time() - start_time
+            if not self._gzip_rejected(response, headers):
+                return response
 
-            # Log timing to debug level
-            logging.debug(f"Highlights API request took {request_time:.2f} seconds")
+    async def _asend(self, payload: Dict[str, Any], timeout: float) -> httpx.Response:
+        """
+        Send a request payload to the Highlights API without blocking the event loop.
 
-            if response.status_code != 200:
-                logging.error(f"Highlights API error: {response.status_code} - {response.text}")
-                print(f"❌ Highlights API error: {response.status_code}")
-                return []
+        Args:
+            payload: The request payload
+            timeout: Request timeout in seconds
 
-            result = response.json()
+        Returns:
+            The response
+        """
+        retries = 0
+        while True:
+            body, headers = self._encode_payload(payload)
+            response = await self._get_async_client().post(
+                self.BASE_URL,
+                headers=headers,
+                content=body,
+                timeout=timeout
+            )
+            if self._gzip_rejected(response, headers):
+                continue
+            if response.status_code not in self.RETRY_STATUSES or retries >= self.MAX_RETRIES:
+                return response
+            # Retry transient gateway errors like the sync session does
+            retries += 1
+            logger.debug("Highlights API returned %s, retrying (%d/%d)", response.status_code, retries, self.MAX_RETRIES)
+            await asyncio.sleep(self.RETRY_BACKOFF * 2 ** (retries - 1))
+
+    @staticmethod
+    def _decode_response(content: bytes) -> Dict[str, Any]:
+        """Decode a JSON response body, with orjson if it is installed."""
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
+
+    @staticmethod
+    def _parse_response(result: Dict[str, Any], offset: int) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Parse a Highlights API response.
 
-            # Log metadata from the response - this is what we want to show
-            if "metadata" in result:
-                metadata = result.get("metadata", {})
-                logging.debug(f"Highlights API metadata: {json.dumps(metadata)}")
+        Args:
+            result: The decoded JSON response
+            offset: Position of the first chunk of the request in the whole document, added to each chunk index
+
+        Returns:
+            List of highlights with text, relevance score and chunk index, and the response metadata if any
+        """
+        metadata = result.get("metadata")
+        if metadata is not None:
+            logger.debug("Highlights API metadata: %s", metadata)
+
+        # Log full response to debug level only
+        logger.debug("Received response from Highlights API: %s", result)
+
+        # Process the results based on the actual API response structure
+        highlights = [
+            {"text": res["chunk_txt"], "relevance": res["chunk_score"], "chunk_index": res["original_index"] + offset}
+            for res in result.get("results") or []
+        ]
+
+        return highlights, metadata
+
+    def _post_chunks(self, chunks: List[str], query: str, top_n: int, offset: int = 0, timeout: float = 60) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Send a single request for a list of chunks to the Highlights API.
+
+        Args:
+            chunks: List of text chunks to analyze
+            query: The query to find relevant highlights for
+            top_n: Maximum number of highlights to return
+            offset: Position of the first chunk in the whole document, added to each chunk index
+            timeout: Request timeout in seconds
+
+        Returns:
+            List of highlights with text, relevance score and chunk index, and the response metadata if any
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails or the API returns an error
+        """
+        response = self._send(self._payload(chunks, query, top_n), timeout)
+
+        if response.status_code != 200:
+            logger.error("Highlights API error: %s - %s", response.status_code, response.text)
+            raise requests.exceptions.HTTPError(f"{response.status_code} error from Highlights API", response=response)
+
+        return self._parse_response(self._decode_response(response.content), offset)
+
+    async def _apost_chunks(self, chunks: List[str], query: str, top_n: int, offset: int = 0, timeout: float = 60) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Send a single request for a list of chunks to the Highlights API without blocking the event loop.
+
+        Args:
+            chunks: List of text chunks to analyze
+            query: The query to find relevant highlights for
+            top_n: Maximum number of highlights to return
+            offset: Position of the first chunk in the whole document, added to each chunk index
+            timeout: Request timeout in seconds
+
+        Returns:
+            List of highlights with text, relevance score and chunk index, and the response metadata if any
+
+        Raises:
+            httpx.HTTPError: If the request fails or the API returns an error
+        """
+        response = await self._asend(self._payload(chunks, query, top_n), timeout)
+
+        if response.status_code != 200:
+            logger.error("Highlights API error: %s - %s", response.status_code, response.text)
+            raise httpx.HTTPStatusError(f"{response.status_code} error from Highlights API", request=response.request, response=response)
+
+        return self._parse_response(self._decode_response(response.content), offset)
+
+    def _merge_responses(self, responses: List[Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]], top_n: int, positions: List[int], request_time: float) -> List[Dict[str, Any]]:
+        """
+        Merge the responses of the batches of a request into a single list of highlights.
+
+        Args:
+            responses: Highlights and metadata of each batch
+            top_n: Maximum number of highlights to return
+            positions: Position in the document of each distinct chunk that was sent
+            request_time: Time taken by all the batches in seconds
+
+        Returns:
+            List of highlights with text, relevance score and chunk index, in document order
+        """
+        # Log timing to debug level
+        logger.debug("Highlights API request took %.2f seconds for %d batch(es)", request_time, len(responses))
+
+        # Log metadata from the responses - this is what we want to show
+        if logger.isEnabledFor(logging.INFO):
+            metadatas = [metadata for _, metadata in responses if metadata is not None]
+            if metadatas:
+                num_query_tokens = metadatas[0].get('num_query_tokens', 'N/A')
+                context_tokens = [metadata.get('num_context_tokens') for metadata in metadatas]
+                num_context_tokens = sum(context_tokens) if None not in context_tokens else 'N/A'
 
                 # Clean console output with just the essential information
-                print(f"✅ Highlights API: Request completed in {request_time:.2f}s | Query tokens: {metadata.get('num_query_tokens', 'N/A')} | Context tokens: {metadata.get('num_context_tokens', 'N/A')}")
+                logger.info("✅ Highlights API: Request completed in %.2fs | Query tokens: %s | Context tokens: %s",
+                            request_time, num_query_tokens, num_context_tokens)
             else:
-                logging.debug(f"No metadata found in Highlights API response")
-                print(f"✅ Highlights API: Request completed in {request_time:.2f}s | No metadata available")
-
-            # Log full response to debug level only
-            logging.debug(f"Received response from Highlights API: {result}")
-
-            # Format according to the actual API response structure
-            highlights = []
-            results = result.get("results", [])
-            for res in results:
-                highlights.append({
-                    "text": res["chunk_txt"],
-                    "relevance": res["chunk_score"]
-                })
-
-            return highlights
+                logger.debug("No metadata found in Highlights API response")
+                logger.info("✅ Highlights API: Request completed in %.2fs | No metadata available", request_time)
+
+        highlights = [highlight for batch_highlights, _ in responses for highlight in batch_highlights]
+        if not highlights:
+            logger.warning("No results returned from Highlights API")
+            return []
+
+        if len(responses) > 1:
+            # Keep the best results across batches, in document order like a single request
+            highlights = heapq.nlargest(top_n, highlights, key=lambda highlight: highlight["relevance"])
+            highlights.sort(key=lambda highlight: highlight["chunk_index"])
+
+        # Map indexes in the deduplicated list back to positions in the document
+        for highlight in highlights:
+            highlight["chunk_index"] = positions[highlight["chunk_index"]]
+
+        return highlights
+
+    def get_highlights(self, text: str, query: str, max_highlights: int = 5) -> List[Dict[str, Any]]:
+        """
+        Get highlights from text based on a query.
+
+        Args:
+            text: The text to analyze
+            query: The query to find relevant highlights for
+            max_highlights: Maximum number of highlights to return
+
+        Returns:
+            List of highlights with text and relevance score
+        """
+        early_result = self._check_text_request(text, query)
+        if early_result is not None:
+            return early_result
+
+        try:
+            logger.info("🔍 Highlights API: Sending request with query: '%s'...", query)
+
+            start_time = time.time()
+            response = self._post_chunks([text], query, max_highlights, timeout=30)  # Add timeout to prevent hanging
+            highlights = self._merge_responses([response], max_highlights, [0], time.time() - start_time)
+
+            return [{"text": highlight["text"], "relevance": highlight["relevance"]} for highlight in highlights]
         except requests.exceptions.RequestException as e:
-            logging.error(f"Error getting highlights: {e}\nTraceback: {traceback.format_exc()}")
-            print(f"❌ Highlights API error: {str(e)}")
+            logger.error("Error getting highlights: %s", e, exc_info=True)
             return []
         except Exception as e:
-            logging.error(f"Unexpected error in get_highlights: {e}\nTraceback: {traceback.format_exc()}")
-            print(f"❌ Highlights API unexpected error: {str(e)}")
+            logger.error("Unexpected error in get_highlights: %s", e, exc_info=True)
             return []
 
     def get_highlights_from_chunks(self, chunks: List[str], query: str, max_highlights_per_chunk: int = 10) -> List[Dict[str, Any]]:
@@ -140,90 +506,178 @@ class HighlightsAPI:
         Returns:
             List of highlights with text and relevance score
         """
-        if not chunks:
-            logging.warning("Empty chunks provided to get_highlights_from_chunks")
-            return []
+        early_result = self._check_chunks_request(chunks, query)
+        if early_result is not None:
+            return early_result
 
-        if not query or not query.strip():
-            logging.warning("Empty query provided to get_highlights_from_chunks")
+        cache_key = self._cache_key(chunks, query, max_highlights_per_chunk)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Highlights API cache hit for query: %s", query)
+            return list(cached)
+
+        if self._semantic_cache is not None:
+            cached = self._semantic_cache.get(chunks, query, max_highlights_per_chunk)
+            if cached is not None:
+                return cached
+
+        unique_chunks, positions = self._unique_chunks(chunks)
+
+        try:
+            logger.debug("Sending request to Highlights API with query: %s (%d duplicate chunks skipped)", query, len(chunks) - len(unique_chunks))
+            logger.info("🔍 Highlights API: Sending request with query: '%s' for %d chunks...", query, len(unique_chunks))
+
+            start_time = time.time()
+            if len(unique_chunks) <= self.BATCH_SIZE:
+                responses = [self._post_chunks(unique_chunks, query, max_highlights_per_chunk, timeout=60)]  # Longer timeout for larger request
+            else:
+                # Score large documents as several smaller requests sent concurrently
+                offsets = range(0, len(unique_chunks), self.BATCH_SIZE)
+                with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENT_REQUESTS, len(offsets))) as executor:
+                    responses = list(executor.map(
+                        lambda offset: self._post_chunks(unique_chunks[offset:offset + self.BATCH_SIZE], query, max_highlights_per_chunk, offset=offset, timeout=30),
+                        offsets
+                    ))
+
+            highlights = self._merge_responses(responses, max_highlights_per_chunk, positions, time.time() - start_time)
+            if highlights:
+                self._cache.set(cache_key, highlights)
+                if self._semantic_cache is not None:
+                    self._semantic_cache.set(chunks, query, max_highlights_per_chunk, highlights)
+            return list(highlights)
+        except requests.exceptions.RequestException as e:
+            logger.error("Error getting highlights: %s", e, exc_info=True)
+            return []
+        except Exception as e:
+            logger.error("Unexpected error in get_highlights_from_chunks: %s", e, exc_info=True)
             return []
 
-        if self.api_key == "missing_api_key":
-            # Simulate highlights for testing when API key is missing
-            logging.warning("Using simulated highlights due to missing API key")
-            return [{"text": f"Simulated highlight for query: {query} (chunk {i})", "relevance": 0.95 - (i * 0.05), "chunk_index": i}
-                    for i in range(min(5, len(chunks)))]
+    async def get_highlights_from_chunks_async(self, chunks: List[str], query: str, max_highlights_per_chunk: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get highlights from multiple text chunks based on a query, without blocking the event loop.
 
-        headers = {
-            "Content-Type": "application/json",
-            "X-API-Key": self.api_key
-        }
+        Args:
+            chunks: List of text chunks to analyze
+            query: The query to find relevant highlights for
+            max_highlights_per_chunk: Maximum number of highlights to return per chunk
 
-        payload = {
-            "query": query,
-            "chunk_txts": chunks,
-            "top_n": max_highlights_per_chunk,
-            "true_order": True
-        }
+        Returns:
+            List of highlights with text and relevance score
+        """
+        early_result = self._check_chunks_request(chunks, query)
+        if early_result is not None:
+            return early_result
+
+        cache_key = self._cache_key(chunks, query, max_highlights_per_chunk)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Highlights API cache hit for query: %s", query)
+            return list(cached)
+
+        if self._semantic_cache is not None:
+            # Embedding the query is CPU-bound, so keep it off the event loop
+            cached = await asyncio.to_thread(self._semantic_cache.get, chunks, query, max_highlights_per_chunk)
+            if cached is not None:
+                return cached
+
+        unique_chunks, positions = self._unique_chunks(chunks)
 
         try:
-            # Only log to debug level to avoid console clutter
-            logging.debug(f"Sending request to Highlights API with query: {query}")
-            print(f"\n🔍 Highlights API: Sending request with query: '{query}' for {len(chunks)} chunks...")
+            logger.debug("Sending request to Highlights API with query: %s (%d duplicate chunks skipped)", query, len(chunks) - len(unique_chunks))
+            logger.info("🔍 Highlights API: Sending request with query: '%s' for %d chunks...", query, len(unique_chunks))
 
             start_time = time.time()
-            response = requests.post(
-                self.BASE_URL,
-                headers=headers,
-                json=payload,
-                timeout=60  # Longer timeout for larger request
-            )
-            request_time = time.time() - start_time
+            if len(unique_chunks) <= self.BATCH_SIZE:
+                responses = [await self._apost_chunks(unique_chunks, query, max_highlights_per_chunk, timeout=60)]  # Longer timeout for larger request
+            else:
+                # Score large documents as several smaller requests sent concurrently
+                semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+                async def post_batch(offset: int):
+                    async with semaphore:
+                        return await self._apost_chunks(unique_chunks[offset:offset + self.BATCH_SIZE], query, max_highlights_per_chunk, offset=offset, timeout=30)
+
+                responses = await asyncio.gather(*(post_batch(offset) for offset in range(0, len(unique_chunks), self.BATCH_SIZE)))
+
+            highlights = self._merge_responses(responses, max_highlights_per_chunk, positions, time.time() - start_time)
+            if highlights:
+                self._cache.set(cache_key, highlights)
+                if self._semantic_cache is not None:
+                    await asyncio.to_thread(self._semantic_cache.set, chunks, query, max_highlights_per_chunk, highlights)
+            return list(highlights)
+        except httpx.HTTPError as e:
+            logger.error("Error getting highlights: %s", e, exc_info=True)
+            return []
+        except Exception as e:
+            logger.error("Unexpected error in get_highlights_from_chunks_async: %s", e, exc_info=True)
+            return []
 
-            # Log timing to debug level
-            logging.debug(f"Highlights API request took {request_time:.2f} seconds")
+    async def get_highlights_from_chunk_stream_async(self, chunk_stream: AsyncIterator[str], query: str, max_highlights_per_chunk: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get highlights from text chunks that are still being produced, based on a query.
 
-            if response.status_code != 200:
-                logging.error(f"Highlights API error: {response.status_code} - {response.text}")
-                print(f"❌ Highlights API error: {response.status_code}")
-                return []
+        Each batch of chunks is sent as soon as it is complete, so scoring overlaps with
+        extracting and chunking the rest of the document.
 
-            result = response.json()
+        Args:
+            chunk_stream: Async iterator over the text chunks to analyze, in document order
+            query: The query to find relevant highlights for
+            max_highlights_per_chunk: Maximum number of highlights to return per chunk
 
-            # Log metadata from the response - this is what we want to show
-            if "metadata" in result:
-                metadata = result.get("metadata", {})
-                logging.debug(f"Highlights API metadata: {json.dumps(metadata)}")
+        Returns:
+            List of highlights with text and relevance score
+        """
+        if not query or not query.strip() or self.api_key == "missing_api_key":
+            # Nothing is sent in these cases, so handle them with the complete list of chunks
+            return await self.get_highlights_from_chunks_async([chunk async for chunk in chunk_stream], query, max_highlights_per_chunk)
 
-                # Clean console output with just the essential information
-                print(f"✅ Highlights API: Request completed in {request_time:.2f}s | Query tokens: {metadata.get('num_query_tokens', 'N/A')} | Context tokens: {metadata.get('num_context_tokens', 'N/A')}")
-            else:
-                logging.debug(f"No metadata found in Highlights API response")
-                print(f"✅ Highlights API: Request completed in {request_time:.2f}s | No metadata available")
+        chunks = []
+        first_indexes = {}
+        unique_chunks = []
+        tasks = []
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
 
-            # Log full response to debug level only
-            logging.debug(f"Received response from Highlights API: {result}")
+        async def post_batch(offset: int):
+            async with semaphore:
+                return await self._apost_chunks(unique_chunks[offset:offset + self.BATCH_SIZE], query, max_highlights_per_chunk, offset=offset, timeout=30)
 
-            # Process the results based on the actual API response structure
-            highlights = []
-            results = result.get("results", [])
-            if not results:
-                logging.warning("No results returned from Highlights API")
-                return []
+        try:
+            logger.info("🔍 Highlights API: Sending requests with query: '%s' as chunks are extracted...", query)
 
-            for res in results:
-                highlights.append({
-                    "text": res["chunk_txt"],
-                    "relevance": res["chunk_score"],
-                    "chunk_index": res["original_index"]
-                })
+            start_time = time.time()
+            async for chunk in chunk_stream:
+                if chunk not in first_indexes:
+                    # Send repeated chunks such as page headers and footers only once
+                    first_indexes[chunk] = len(chunks)
+                    unique_chunks.append(chunk)
+                    if len(unique_chunks) % self.BATCH_SIZE == 0:
+                        tasks.append(asyncio.create_task(post_batch(len(unique_chunks) - self.BATCH_SIZE)))
+                chunks.append(chunk)
+
+            if not chunks:
+                logger.warning("Empty chunks provided to get_highlights_from_chunk_stream_async")
+                return []
 
-            return highlights
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Error getting highlights: {e}\nTraceback: {traceback.format_exc()}")
-            print(f"❌ Highlights API error: {str(e)}")
-            return []
-        except Exception as e:
-            logging.error(f"Unexpected error in get_highlights_from_chunks: {e}\nTraceback: {traceback.format_exc()}")
-            print(f"❌ Highlights API unexpected error: {str(e)}")
-            return []
\ No newline at end of file
+            if len(unique_chunks) % self.BATCH_SIZE:
+                tasks.append(asyncio.create_task(post_batch(len(tasks) * self.BATCH_SIZE)))
+
+            # Errors from the extraction stream propagate, but API errors are handled like in
+            # get_highlights_from_chunks_async
+            try:
+                responses = await asyncio.gather(*tasks)
+                highlights = self._merge_responses(responses, max_highlights_per_chunk, list(first_indexes.values()), time.time() - start_time)
+                if highlights:
+                    self._cache.set(self._cache_key(chunks, query, max_highlights_per_chunk), highlights)
+                    if self._semantic_cache is not None:
+                        await asyncio.to_thread(self._semantic_cache.set, chunks, query, max_highlights_per_chunk, highlights)
+                return list(highlights)
+            except httpx.HTTPError as e:
+                logger.error("Error getting highlights: %s", e, exc_info=True)
+                return []
+            except Exception as e:
+                logger.error("Unexpected error in get_highlights_from_chunk_stream_async: %s", e, exc_info=True)
+                return []
+        finally:
+            # Stop batches that are still in flight if the stream or another batch failed
+            for task in tasks:
+                task.cancel()
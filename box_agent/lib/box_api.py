@@ -1,7 +1,8 @@
+import codecs
 import json
 import logging
 from dataclasses import dataclass
-from typing import Iterable, List, Union
+from typing import Iterable, Iterator, List, Union
 
 import requests
 from box_sdk_gen import (
@@ -32,6 +33,22 @@ class BoxFileExtended:
     text_representation: str
 
 
+def _requests_session(box_client: BoxClient) -> requests.Session:
+    """
+    Get the HTTP session of a Box client, so direct downloads reuse its pooled connections.
+
+    This is an internal helper function and should not be called directly.
+
+    Args:
+        box_client (BoxClient): An authenticated Box client object.
+
+    Returns:
+        requests.Session: The client's session, or the requests module if it has none.
+    """
+    network_client = box_client.network_session.network_client
+    return getattr(network_client, "requests_session", None) or requests
+
+
 def _do_request(box_client: BoxClient, url: str):
     """
     Performs a GET request to a Box API endpoint using the provided Box client.
@@ -55,7 +72,9 @@ def _do_request(box_client: BoxClient, url: str):
     except BoxSDKError as e:
         raise e
 
-    resp = requests.get(url, headers={"Authorization": f"Bearer {access_token}"})
+    resp = _requests_session(box_client).get(
+        url, headers={"Authorization": f"Bearer {access_token}"}
+    )
     resp.raise_for_status()
     return resp.content
 
@@ -64,36 +83,85 @@ def box_file_get_by_id(client: BoxClient, file_id: str) -> File:
     return client.files.get_file_by_id(file_id=file_id)
 
 
-def box_file_text_extract(client: BoxClient, file_id: str) -> str:
+def box_file_get_with_text_representation(
+    client: BoxClient, file_id: str, fields: List[str] | None = None
+) -> File:
+    """
+    Get a file together with its "extracted_text" representation, so its text can be
+    downloaded without another metadata request.
+
+    Args:
+        client (BoxClient): An authenticated Box client object.
+        file_id (str): The ID of the file.
+        fields (List[str] | None): Fields to request in addition to the name and representations.
+
+    Returns:
+        File: The file with the requested fields.
+    """
     # Request the file with the "extracted_text" representation hint
-    file_text_representation = client.files.get_file_by_id(
+    return client.files.get_file_by_id(
         file_id,
         x_rep_hints="[extracted_text]",
-        fields=["name", "representations"],
+        fields=["name", "representations", *(fields or [])],
     )
+
+
+def box_file_text_url(client: BoxClient, file: File) -> str | None:
+    """
+    Get the download URL of a file's "extracted_text" representation.
+
+    Args:
+        client (BoxClient): An authenticated Box client object.
+        file (File): The file, as returned by box_file_get_with_text_representation.
+
+    Returns:
+        str | None: The download URL, or None if the file has no text representation.
+    """
     # Check if any representations exist
-    if not file_text_representation.representations.entries:
-        logger.debug(f"No representation for file {file_text_representation.id}")
-        return ""
+    if not file.representations or not file.representations.entries:
+        logger.debug(f"No representation for file {file.id}")
+        return None
 
     # Find the "extracted_text" representation
     extracted_text_entry = next(
         (
             entry
-            for entry in file_text_representation.representations.entries
+            for entry in file.representations.entries
             if entry.representation == "extracted_text"
         ),
         None,
     )
     if not extracted_text_entry:
-        return ""
+        return None
 
     # Handle cases where the extracted text needs generation
     if extracted_text_entry.status.state == "none":
-        _do_request(extracted_text_entry.info.url)  # Trigger text generation
+        _do_request(client, extracted_text_entry.info.url)  # Trigger text generation
 
     # Construct the download URL and sanitize filename
-    url = extracted_text_entry.content.url_template.replace("{+asset_path}", "")
+    return extracted_text_entry.content.url_template.replace("{+asset_path}", "")
+
+
+def _box_file_text_url(client: BoxClient, file_id: str) -> str | None:
+    """
+    Get the download URL of a file's "extracted_text" representation from its ID.
+
+    This is an internal helper function and should not be called directly.
+
+    Args:
+        client (BoxClient): An authenticated Box client object.
+        file_id (str): The ID of the file.
+
+    Returns:
+        str | None: The download URL, or None if the file has no text representation.
+    """
+    return box_file_text_url(client, box_file_get_with_text_representation(client, file_id))
+
+
+def box_file_text_extract(client: BoxClient, file_id: str) -> str:
+    url = _box_file_text_url(client, file_id)
+    if url is None:
+        return ""
 
     # Download and truncate the raw content
     raw_content = _do_request(client, url)
@@ -105,6 +173,57 @@ def box_file_text_extract(client: BoxClient, file_id: str) -> str:
         return raw_content
 
 
+def box_file_text_extract_stream(
+    client: BoxClient, file_id: str, chunk_size: int = 64 * 1024
+) -> Iterator[str]:
+    """
+    Stream the text representation of a file instead of downloading it all at once.
+
+    Args:
+        client (BoxClient): An authenticated Box client object.
+        file_id (str): The ID of the file.
+        chunk_size (int): Number of bytes read from the network at a time.
+
+    Yields:
+        str: Consecutive pieces of the file's text.
+    """
+    url = _box_file_text_url(client, file_id)
+    if url is None:
+        return
+
+    yield from box_file_text_url_stream(client, url, chunk_size)
+
+
+def box_file_text_url_stream(
+    client: BoxClient, url: str, chunk_size: int = 64 * 1024
+) -> Iterator[str]:
+    """
+    Stream text from a representation download URL, such as one returned by box_file_text_url.
+
+    Args:
+        client (BoxClient): An authenticated Box client object.
+        url (str): The download URL of the text representation.
+        chunk_size (int): Number of bytes read from the network at a time.
+
+    Yields:
+        str: Consecutive pieces of the text.
+    """
+    access_token = client.auth.retrieve_token().access_token
+    with _requests_session(client).get(
+        url, headers={"Authorization": f"Bearer {access_token}"}, stream=True
+    ) as resp:
+        resp.raise_for_status()
+        # Decode incrementally so multi-byte characters split across reads are kept intact
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        for data in resp.iter_content(chunk_size=chunk_size):
+            text = decoder.decode(data)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
+
+
 def box_file_ai_ask(
     client: BoxClient, file_id: str, prompt: str, ai_agent: AiAgentAsk = None
 ) -> str:
@@ -1,6 +1,11 @@
+import functools
 from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
 from box_sdk_gen import (
     BoxClient,
+    BoxNetworkClient,
+    NetworkSession,
     CCGConfig,
     BoxCCGAuth,
     FileWithInMemoryCacheTokenStorage,
@@ -47,7 +52,24 @@ class BoxAuth:
     def get_ccg_client(self) -> BoxClient:
         conf = self.get_ccg_config()
         auth = BoxCCGAuth(conf)
-        return self.add_extra_header_to_box_client(BoxClient(auth))
+        network_session = NetworkSession(
+            network_client=BoxNetworkClient(requests_session=self.get_requests_session())
+        )
+        return self.add_extra_header_to_box_client(
+            BoxClient(auth, network_session=network_session)
+        )
+
+
+    def get_requests_session(self) -> requests.Session:
+        """
+        Create the HTTP session used by the Box client.
+
+        Returns:
+            requests.Session: A session whose connection pool is large enough for concurrent tool calls.
+        """
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_maxsize=32))
+        return session
 
 
 
@@ -72,3 +94,14 @@ class BoxAuth:
             self.client = self.get_ccg_client()
             
         return self.client
+
+
+@functools.lru_cache(maxsize=1)
+def get_box_client() -> BoxClient:
+    """
+    Get the Box client, created once per process and shared by all callers.
+
+    Returns:
+        BoxClient: An authenticated Box client object.
+    """
+    return BoxAuth().get_client()
@@ -0,0 +1,149 @@
+import functools
+import hashlib
+import heapq
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+    from fastembed import TextEmbedding
+except ImportError:
+    np = None
+    TextEmbedding = None
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    A cache of highlights keyed by the chunks of a document and the meaning of the query, so
+    rephrased queries about the same document reuse earlier results. Requires fastembed.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "BAAI/bge-small-en-v1.5",
+        threshold: float = 0.92,
+        maxsize: int = 64,
+        max_queries: int = 32,
+    ):
+        """
+        Initialize the cache. The embedding model is loaded on first use.
+
+        Args:
+            model_name: The fastembed model used to embed queries
+            threshold: Minimum cosine similarity for a cached query to be reused
+            maxsize: Maximum number of documents kept before the least recently used is evicted
+            max_queries: Maximum number of queries kept per document
+        """
+        self.model_name = model_name
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.max_queries = max_queries
+        self._model = None
+        self._data: "OrderedDict[bytes, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Lookups and stores for the same query only embed it once
+        self._embed = functools.lru_cache(maxsize=256)(self._embed_query)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the embedding dependencies are installed."""
+        return TextEmbedding is not None
+
+    def _embed_query(self, query: str) -> "np.ndarray":
+        """
+        Embed a query as a unit vector.
+
+        Args:
+            query: The query to embed
+
+        Returns:
+            The normalized query embedding
+        """
+        with self._lock:
+            if self._model is None:
+                self._model = TextEmbedding(model_name=self.model_name)
+            model = self._model
+        embedding = next(iter(model.embed([query])))
+        return embedding / np.linalg.norm(embedding)
+
+    @staticmethod
+    def _content_key(chunks: List[str]) -> bytes:
+        """Hash the chunks of a document."""
+        return hashlib.blake2b("\x1f".join(chunks).encode(), digest_size=16).digest()
+
+    def get(self, chunks: List[str], query: str, top_n: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the highlights of the most similar cached query on the same chunks.
+
+        Args:
+            chunks: List of text chunks
+            query: The query
+            top_n: Number of highlights requested
+
+        Returns:
+            The cached highlights, or None if no cached query is similar enough
+        """
+        if not self.enabled:
+            return None
+
+        key = self._content_key(chunks)
+        with self._lock:
+            entries = self._data.get(key)
+            if not entries:
+                return None
+            # Only results for at least as many highlights can answer this request
+            entries = [entry for entry in entries if entry[1] >= top_n]
+        if not entries:
+            return None
+
+        embedding = self._embed(query)
+        similarity, highlights = max(
+            ((float(np.dot(embedding, cached_embedding)), cached_highlights)
+             for cached_embedding, _, cached_highlights in entries),
+            key=lambda entry: entry[0],
+        )
+        if similarity < self.threshold:
+            return None
+
+        with self._lock:
+            # The document may have been evicted while the query was being embedded
+            if key in self._data:
+                self._data.move_to_end(key)
+
+        logger.debug("Semantic cache hit for query: %s (similarity %.3f)", query, similarity)
+        if len(highlights) > top_n:
+            highlights = heapq.nlargest(top_n, highlights, key=lambda highlight: highlight["relevance"])
+            highlights.sort(key=lambda highlight: highlight["chunk_index"])
+        return list(highlights)
+
+    def set(self, chunks: List[str], query: str, top_n: int, highlights: List[Dict[str, Any]]) -> None:
+        """
+        Store the highlights for a query on a list of chunks.
+
+        Args:
+            chunks: List of text chunks
+            query: The query
+            top_n: Number of highlights requested
+            highlights: The highlights returned for the query
+        """
+        if not self.enabled:
+            return
+
+        embedding = self._embed(query)
+        key = self._content_key(chunks)
+        with self._lock:
+            entries = self._data.setdefault(key, [])
+            entries.append((embedding, top_n, highlights))
+            del entries[:-self.max_queries]
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._data.clear()
@@ -1,12 +1,52 @@
+import contextlib
+import mmap
 import os
 import tempfile
-from typing import Optional
-from box_agent.lib.box_api import box_file_text_extract
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+from box_agent.lib.box_api import box_file_text_extract, box_file_text_url_stream
 
 try:
-    import PyPDF2
+    import pypdf
 except ImportError:
-    PyPDF2 = None
+    pypdf = None
+
+# PDFs with fewer pages than this per worker are extracted in a single process
+MIN_PAGES_PER_WORKER = 8
+
+
+@contextlib.contextmanager
+def _open_pdf(file_path: str) -> Iterator["pypdf.PdfReader"]:
+    """
+    Open a PDF file for reading through a read-only memory map.
+
+    Given a path, pypdf reads the whole file into memory. A memory map lets the OS page
+    in only the parts that are read, and share those pages between worker processes.
+
+    Args:
+        file_path: Path to the PDF file
+
+    Returns:
+        A PDF reader, valid until the context exits
+    """
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield pypdf.PdfReader(mapped)
+
+
+def _extract_pages_text(file_path: str, start: int, stop: int) -> List[str]:
+    """
+    Extract the text of a range of pages of a PDF file. Runs in a worker process.
+
+    Args:
+        file_path: Path to the PDF file
+        start: Index of the first page
+        stop: Index after the last page
+
+    Returns:
+        The text of each page
+    """
+    with _open_pdf(file_path) as reader:
+        return [reader.pages[page_num].extract_text() for page_num in range(start, stop)]
 
 
 class PDFTextExtractor:
@@ -25,22 +65,27 @@ class PDFTextExtractor:
         Returns:
             Extracted text or None if extraction failed
         """
-        if PyPDF2 is None:
-            raise ImportError("PyPDF2 is required for PDF text extraction. Install it with 'pip install PyPDF2'.")
+        if pypdf is None:
+            raise ImportError("pypdf is required for PDF text extraction. Install it with 'pip install pypdf'.")
 
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"PDF file not found: {file_path}")
 
         try:
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
+            with _open_pdf(file_path) as reader:
+                num_pages = len(reader.pages)
+                workers = min(os.cpu_count() or 1, num_pages // MIN_PAGES_PER_WORKER)
+                if workers <= 1:
+                    pages = [page.extract_text() for page in reader.pages]
 
-                for page_num in range(len(reader.pages)):
-                    page = reader.pages[page_num]
-                    text += page.extract_text() + "\n\n"
+            if workers > 1:
+                # Page extraction is CPU-bound, so split the pages into one contiguous range per process
+                bounds = [num_pages * i // workers for i in range(workers + 1)]
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    ranges = executor.map(_extract_pages_text, [file_path] * workers, bounds[:-1], bounds[1:])
+                    pages = [page for page_range in ranges for page in page_range]
 
-                return text
+            return "".join(f"{page}\n\n" for page in pages)
         except Exception as e:
             print(f"Error extracting text from PDF: {e}")
             return None
@@ -60,12 +105,65 @@ class PDFTextExtractor:
         try:
             # Use the box_file_text_extract function to get the text content directly
             text = box_file_text_extract(box_client, file_id)
-            # Clean the text by removing extra whitespace and normalizing line endings
-            if text:
-                text = ' '.join(text.split())  # Remove extra whitespace
-                text = text.replace('\t', ' ')  # Replace tabs with spaces
-                text = text.strip()  # Remove leading/trailing whitespace
-            return text
+            return PDFTextExtractor.clean_text(text)
         except Exception as e:
             print(f"Error extracting text from Box PDF: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    @staticmethod
+    def clean_text(text: Optional[str]) -> Optional[str]:
+        """
+        Clean text extracted from a PDF.
+
+        Args:
+            text: Raw extracted text
+
+        Returns:
+            Text with extra whitespace removed and line endings normalized
+        """
+        if text:
+            # Collapses all whitespace, tabs and newlines included, and drops it at both ends
+            text = ' '.join(text.split())
+        return text
+
+    @staticmethod
+    def extract_text_stream_from_box_url(url: str, box_client) -> Iterator[str]:
+        """
+        Stream the text of a Box PDF file without holding the whole document in memory.
+
+        Args:
+            url: Download URL of the file's text representation
+            box_client: Box client instance
+
+        Returns:
+            Iterator over consecutive pieces of cleaned text
+        """
+        return PDFTextExtractor.clean_text_stream(box_file_text_url_stream(box_client, url))
+
+    @staticmethod
+    def clean_text_stream(texts: Iterable[str]) -> Iterator[str]:
+        """
+        Clean text extracted from a PDF as it arrives in pieces.
+
+        Args:
+            texts: Consecutive pieces of raw extracted text
+
+        Returns:
+            Iterator over pieces that together equal clean_text applied to the whole text
+        """
+        started = False
+        pending_space = False
+        for text in texts:
+            words = text.split()
+            if not words:
+                pending_space = pending_space or bool(text)
+                continue
+
+            cleaned = ' '.join(words)
+            # Whitespace on either side of a piece boundary collapses to a single space
+            if started and (pending_space or text[0].isspace()):
+                cleaned = ' ' + cleaned
+            yield cleaned
+
+            started = True
+            pending_space = text[-1].isspace()
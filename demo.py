@@ -1,5 +1,7 @@
 import asyncio
-import time
+import os
+import re
+import sys
 
 import logging
 
@@ -22,6 +24,9 @@ from box_agent.lib.formatting import strip_markdown
 logger = logging.getLogger(__name__)
 logging.basicConfig(filename="error.log", level=logging.DEBUG)
 
+# Set DEMO_SLOW_PRINT=false to print prompts and answers at once instead of typing them out
+SLOW_PRINT = os.getenv("DEMO_SLOW_PRINT", "true").lower() not in ("0", "false", "no")
+
 box_agent = Agent(
     name="Box Agent",
     instructions="""
@@ -43,13 +48,17 @@ box_agent = Agent(
 )
 
 
-def slow_print(text: str, delay=0.1):
-    """Prints a string character by character with a delay."""
+async def slow_print(text: str, delay=0.1):
+    """Prints a string word by word, pausing as long as typing each word with a per-character delay would."""
     # remove any \n characters
     text = text.replace("\n", "")
-    for char in text:
-        print(char, end="", flush=True)
-        time.sleep(delay)
+    if not SLOW_PRINT:
+        print(text)
+        return
+    for word in re.findall(r"\S+\s*|\s+", text):
+        sys.stdout.write(word)
+        sys.stdout.flush()
+        await asyncio.sleep(delay * len(word))
     print()  # Add a newline at the end
 
 
@@ -68,14 +77,15 @@ async def main():
 
     print("How can I help you today:")
     for prompt in prompts:
-        time.sleep(5)
-        slow_print(f"{prompt}", delay=0.15)
+        await asyncio.sleep(5)
         user_msg = prompt
         inputs.append({"content": user_msg, "role": "user"})
+        # The run starts in the background, so the agent works on the prompt while it is typed out
         result = Runner.run_streamed(
             agent,
             input=inputs,
         )
+        await slow_print(f"{prompt}", delay=0.15)
         async for event in result.stream_events():
             if isinstance(event, ResponseTextDeltaEvent):
                 print(event.delta, end="", flush=True)
@@ -89,7 +99,7 @@ async def main():
         print("\n")
         # print the lines one by one with a delay
         for line in lines:
-            slow_print(line, delay=0.02)
+            await slow_print(line, delay=0.02)
 
         print("\nFollow up:")
 
@@ -2,34 +2,29 @@ import asyncio
 import logging
 import os
 import sys
+import threading
 from dotenv import load_dotenv
 
 from openai.types.responses import ResponseContentPartDoneEvent, ResponseTextDeltaEvent
 
-from agents import Agent, Runner, TResponseInputItem
-from agents.tool import WebSearchTool
-
-from box_agent.box import (
-    file_search,
-    ask_box,
-    get_text_from_file,
-    box_search_folder_by_name,
-    box_list_folder_content_by_folder_id,
-    get_highlights_from_file,
-)
+from agents import Runner, TResponseInputItem
 
+from box_agent.app import get_agent
 from box_agent.lib.formatting import strip_markdown
-from box_agent.lib.box_auth import BoxAuth
+from box_agent.lib.box_auth import get_box_client
+from box_agent.highlights_api import HighlightsAPI
 
 # Load environment variables
 load_dotenv()
 
 # Configure logging
+error_log_handler = logging.FileHandler("error.log")
+error_log_handler.setLevel(logging.WARNING)
 logging.basicConfig(
     level=logging.WARNING,  # Only show warnings and above to reduce console clutter
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler("error.log"),
+        error_log_handler,
         logging.StreamHandler(sys.stdout)
     ]
 )
@@ -37,6 +32,16 @@ logging.basicConfig(
 # Set httpx logger to ERROR level to suppress HTTP request logs
 logging.getLogger("httpx").setLevel(logging.ERROR)
 
+# Show Highlights API request status in the console as plain lines, keeping only its
+# warnings and errors in error.log
+highlights_logger = logging.getLogger("box_agent.highlights_api")
+highlights_logger.setLevel(logging.INFO)
+highlights_console_handler = logging.StreamHandler(sys.stdout)
+highlights_console_handler.setFormatter(logging.Formatter("%(message)s"))
+highlights_logger.addHandler(highlights_console_handler)
+highlights_logger.addHandler(error_log_handler)
+highlights_logger.propagate = False
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_MAX_TURNS = 100
@@ -63,7 +68,7 @@ if not BOX_CLIENT_ID or not BOX_CLIENT_SECRET or not BOX_SUBJECT_ID:
 else:
     # Try to authenticate with Box
     try:
-        box_client = BoxAuth().get_client()
+        box_client = get_box_client()
         if box_client:
             current_user = box_client.users.get_user_me()
             logger.info(f"Successfully authenticated with Box as: {current_user.name} (ID: {current_user.id})")
@@ -77,52 +82,36 @@ else:
         print(f"Error: {str(e)}")
         print("Please check your Box credentials in the .env file.")
 
-box_agent = Agent(
-    name="Box Agent",
-    instructions="""
-    You are a very helpful agent.
-    You have access to a number of tools from Box that allow you
-    to search for files in Box either holistically or by set criteria.
-
-    IMPORTANT WORKFLOW:
-    1. When a user asks about a file, first use file_search to find the file and get its ID.
-    2. Once you have the file ID, you can use other tools to work with the file.
-
-    For large files, especially PDFs, you should use the get_highlights_from_file tool
-    which will extract text, chunk it, and use the MK1 Highlights API to find the most
-    relevant parts of the document based on the user's query. This is more efficient
-    than trying to process the entire document at once.
-
-    CRITICAL - QUERY PRESERVATION:
-    When using the get_highlights_from_file tool, you MUST use the EXACT query provided by the user.
-    DO NOT rephrase, summarize, or modify the query in any way.
-    For example, if the user asks "Summarize the Balance sheet for each of the companies 2024 10k individually",
-    you should use "Summarize the Balance sheet for each of the companies 2024 10k individually" as the query,
-    NOT a simplified version like "Balance Sheet" or "Balance Sheet Summary".
-
-    The Highlights API works best when given the exact, detailed query from the user.
-    IMPORTANT - PARAMETER REQUIREMENTS:
-    When calling get_highlights_from_file, you MUST provide ALL required parameters:
-    - file_id: The ID of the file to analyze (you must get this from file_search first)
-    - query: The user's query or what information they're looking for
-    - max_highlights: The number of highlights to return (recommend using 5)
-
-    If you encounter any errors with Box authentication or access, inform the user that
-    there might be an issue with the Box credentials and suggest they check the error logs.
-
-    If you encounter any other errors, provide clear explanations to the user and suggest
-    alternative approaches. Your goal is to help the user find the information they need.
-    """,
-    tools=[
-        file_search,
-        ask_box,
-        get_text_from_file,
-        get_highlights_from_file,
-        box_search_folder_by_name,
-        box_list_folder_content_by_folder_id,
-        WebSearchTool(),
-    ],
-)
+
+async def ainput(prompt: str) -> str:
+    """
+    Read a line from stdin without blocking the event loop.
+
+    The read runs in a daemon thread rather than the default executor, so Ctrl+C can still exit
+    while waiting for the user.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def deliver(set_outcome, outcome):
+        if not future.done():
+            set_outcome(outcome)
+
+    def read():
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            outcome = (future.set_exception, e)
+        else:
+            outcome = (future.set_result, line)
+        try:
+            loop.call_soon_threadsafe(deliver, *outcome)
+        except RuntimeError:
+            # The event loop already closed
+            pass
+
+    threading.Thread(target=read, daemon=True).start()
+    return await future
 
 
 async def main():
@@ -130,8 +119,18 @@ async def main():
     print("This agent can search for files in Box, extract text, and use the MK1 Highlights API")
     print("to find the most relevant parts of documents based on your queries.\n")
 
-    user_msg = input("How can I help you today:\n")
-    agent = box_agent
+    # Keep references to the warm-up tasks so they are not garbage collected while running
+    background_tasks = set()
+
+    def warm_up():
+        task = asyncio.create_task(HighlightsAPI.awarm_up())
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+
+    # Connect to the Highlights API while the user types the first message
+    warm_up()
+    user_msg = await ainput("How can I help you today:\n")
+    agent = get_agent()
     inputs: list[TResponseInputItem] = [{"content": user_msg, "role": "user"}]
     while True:
         try:
@@ -153,22 +152,34 @@ async def main():
             inputs = result.to_input_list()
             print()
 
-            user_msg = input("Follow up:\n")
+            user_msg = await ainput("Follow up:\n")
 
             inputs.append({"content": user_msg, "role": "user"})
         except Exception as e:
             logger.error(f"Error running agent: {e}")
             print(f"\n⚠️ Error: {str(e)}")
             print("Please check the error.log file for more details.")
-            user_msg = input("\nFollow up (or type 'exit' to quit):\n")
+            user_msg = await ainput("\nFollow up (or type 'exit' to quit):\n")
             if user_msg.lower() == 'exit':
                 break
             inputs.append({"content": user_msg, "role": "user"})
 
+        # Connect to the Highlights API while the agent works out which tools to call on the
+        # follow-up; the first turn reuses the connection opened above
+        warm_up()
+
+
+async def run():
+    try:
+        await main()
+    finally:
+        # Close pooled Highlights API connections while the event loop is still running
+        await HighlightsAPI.aclose()
+
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        asyncio.run(run())
     except KeyboardInterrupt:
         print("\n\nExiting Box Agent. Goodbye! 👋")
     except Exception as e: